@@ -0,0 +1,293 @@
+import asyncio
+import errno
+import hashlib
+import mimetypes
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from pydantic import BaseModel
+
+# Size of the pieces handed to os.sendfile / hashlib, large enough to keep syscalls rare.
+CHUNK_SIZE = 1024 * 1024
+
+# Seconds between two checks of the output directory while a tool is running.
+PROGRESS_POLL_INTERVAL = 1.0
+
+# errno values meaning os.sendfile cannot be used with the given descriptors.
+SENDFILE_UNSUPPORTED = (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP)
+
+
+class Artifact(BaseModel):
+    """A generated file announced to the client in the SSE stream."""
+    name: str
+    size: int
+    sha256: str
+    content_type: str
+    url: str | None = None
+
+
+class ArtifactProgress(BaseModel):
+    """
+    Bytes already written for an artifact the tool is still producing.
+
+    Clients can fetch `[offset, offset + length)` with a range request to start
+    playing partial outputs (e.g. audio segments) before the tool ends. An
+    `offset` of 0 for an artifact already announced means it was rewritten.
+    """
+    name: str
+    offset: int
+    length: int
+    content_type: str
+    url: str | None = None
+
+
+def resolve_artifact_path(output_generation_path: str, name: str) -> str:
+    """
+    Resolve an artifact name inside `output_generation_path`.
+
+    Raises ValueError if the name escapes the output directory.
+    """
+    root = os.path.realpath(output_generation_path)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"Artifact {name!r} is outside of {output_generation_path!r}")
+    return path
+
+
+def parse_range_header(range_header: str | None, size: int) -> Tuple[int, int]:
+    """
+    Parse an HTTP `Range: bytes=...` header into an inclusive `(start, end)` pair.
+
+    A missing header selects the whole file. Raises ValueError for malformed or
+    unsatisfiable ranges, which should be answered with a 416 status.
+    """
+    if not range_header:
+        return 0, size - 1
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        raise ValueError(f"Unsupported range: {range_header!r}")
+    start_s, _, end_s = spec.strip().partition("-")
+    if not start_s:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(end_s), 0), size - 1
+    else:
+        start = int(start_s)
+        end = min(int(end_s), size - 1) if end_s else size - 1
+    if start > end or start >= size:
+        raise ValueError(f"Unsatisfiable range {range_header!r} for {size} bytes")
+    return start, end
+
+
+@contextmanager
+def open_artifact_range(path: str, start: int = 0, end: Optional[int] = None) -> Iterator[memoryview]:
+    """
+    Map `[start, end]` of an artifact into memory and yield it as a memoryview.
+
+    Implementation Detail: The view points straight into the page cache, so it
+    can be passed to a transport without an intermediate copy. It must not be
+    used after the context exits. Only use it on finished artifacts: if the file
+    is truncated while mapped, reading past its new end raises SIGBUS.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size - 1 if end is None else min(end, size - 1)
+        if size == 0 or start > end:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            whole = memoryview(mapped)
+            view = whole[start:end + 1]
+            try:
+                yield view
+            finally:
+                view.release()
+                whole.release()
+
+
+def send_artifact(out_fd: int, path: str, start: int = 0, end: Optional[int] = None) -> int:
+    """
+    Write `[start, end]` of an artifact to a socket or file descriptor.
+
+    Uses os.sendfile so the bytes never enter user space, and falls back to
+    os.pread where sendfile is not supported for `out_fd`. Both are safe on
+    artifacts the tool is still writing. Returns the number of bytes sent.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size - 1 if end is None else min(end, size - 1)
+        offset, remaining = start, end - start + 1
+        try:
+            while remaining > 0:
+                sent = os.sendfile(out_fd, f.fileno(), offset, min(remaining, CHUNK_SIZE))
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+            return offset - start
+        except OSError as e:
+            # Only fall back if sendfile refused the descriptor before sending anything
+            if offset != start or e.errno not in SENDFILE_UNSUPPORTED:
+                raise
+
+    # pread rather than mmap: the file may still be rewritten by the tool, and
+    # touching mapped pages past a truncated end of file raises SIGBUS
+    written = 0
+    with open(path, "rb") as f:
+        while offset <= end:
+            data = os.pread(f.fileno(), min(end - offset + 1, CHUNK_SIZE), offset)
+            if not data:
+                break
+            view = memoryview(data)
+            while view:
+                sent = os.write(out_fd, view)
+                view = view[sent:]
+            offset += len(data)
+            written += len(data)
+    return written
+
+
+def file_sha256(path: str) -> str:
+    """Hash an artifact with plain reads into one reusable buffer, safe if the file changes meanwhile."""
+    digest = hashlib.sha256()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb") as f:
+        while read := f.readinto(buffer):
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def get_content_type(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def create_run_output_location(
+    output_generation_path: str, generation_output_url: str | None, run_id: str
+) -> Tuple[str, str | None]:
+    """
+    Create the output directory of one run, `<output_generation_path>/<run_id>`,
+    and return it with its public URL.
+
+    Architecture Decision: Each run writes into its own directory, so its tracker
+    only ever sees the files of that run and never announces another user's outputs.
+    """
+    path = resolve_artifact_path(output_generation_path, run_id)
+    os.makedirs(path, exist_ok=True)
+    url = f"{generation_output_url.rstrip('/')}/{quote(run_id)}" if generation_output_url else None
+    return path, url
+
+
+class ArtifactTracker:
+    """
+    Track the files a tool writes into `output_generation_path`.
+
+    Architecture Decision: The tracker only polls the directory from the streaming
+    engine, so tools don't need to know about it: anything new or modified since
+    the tracker was created is reported as an artifact. The directory should be
+    private to the run (see `create_run_output_location`).
+
+    Implementation Detail: Directory scans run in a worker thread, since they are
+    repeated every `PROGRESS_POLL_INTERVAL` for each active run.
+
+    Usage:
+        tracker = ArtifactTracker(output_generation_path, generation_output_url)
+        progress = await tracker.progress()   # while the tool runs
+        artifacts = await tracker.finalize()  # once the tool has ended
+    """
+
+    def __init__(self, output_generation_path: str, generation_output_url: str | None = None):
+        self.output_generation_path = output_generation_path
+        self.generation_output_url = generation_output_url
+        # Blocking: create the tracker in a worker thread from async code
+        self.initial = self._scan()
+        self.reported: Dict[str, Tuple[int, int, int]] = {}
+
+    def _scan(self) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Map each file name to its (size, mtime_ns, inode).
+
+        Files removed while scanning (e.g. temporary files renamed by the tool) and
+        symlinks pointing outside the output directory are skipped.
+        """
+        files = {}
+        try:
+            entries = os.scandir(self.output_generation_path)
+        except FileNotFoundError:
+            return files
+        with entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    resolve_artifact_path(self.output_generation_path, entry.name)
+                    stat = entry.stat()
+                except (OSError, ValueError):
+                    continue
+                files[entry.name] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        return files
+
+    def _changed(self) -> Dict[str, Tuple[int, int, int]]:
+        return {
+            name: stat
+            for name, stat in self._scan().items()
+            if self.initial.get(name) != stat
+        }
+
+    def _url(self, name: str) -> str | None:
+        if not self.generation_output_url:
+            return None
+        return f"{self.generation_output_url.rstrip('/')}/{quote(name)}"
+
+    async def progress(self) -> List[ArtifactProgress]:
+        """
+        Report the bytes written to each artifact since the previous call.
+
+        A file that shrank, went back in time or was replaced by another file is
+        reported again from offset 0, so clients drop the bytes they already have.
+        """
+        updates = []
+        for name, stat in sorted((await asyncio.to_thread(self._changed)).items()):
+            size, mtime_ns, inode = stat
+            offset = 0
+            if previous := self.reported.get(name):
+                previous_size, previous_mtime_ns, previous_inode = previous
+                rewritten = size < previous_size or mtime_ns < previous_mtime_ns or inode != previous_inode
+                offset = 0 if rewritten else previous_size
+            self.reported[name] = stat
+            if size > offset:
+                updates.append(
+                    ArtifactProgress(
+                        name=name,
+                        offset=offset,
+                        length=size - offset,
+                        content_type=get_content_type(name),
+                        url=self._url(name),
+                    )
+                )
+        return updates
+
+    async def finalize(self) -> List[Artifact]:
+        """Describe every new or modified artifact, scanning and hashing off the event loop."""
+        artifacts = []
+        for name, (size, _, _) in sorted((await asyncio.to_thread(self._changed)).items()):
+            try:
+                path = resolve_artifact_path(self.output_generation_path, name)
+                sha256 = await asyncio.to_thread(file_sha256, path)
+            except (OSError, ValueError):
+                # Removed or replaced by a symlink since the scan
+                continue
+            artifacts.append(
+                Artifact(
+                    name=name,
+                    size=size,
+                    sha256=sha256,
+                    content_type=get_content_type(name),
+                    url=self._url(name),
+                )
+            )
+        # Artifacts written by a later tool call are reported again from scratch
+        self.initial = await asyncio.to_thread(self._scan)
+        self.reported = {}
+        return artifacts
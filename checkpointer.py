@@ -0,0 +1,650 @@
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+# Blobs larger than this are zlib-compressed before being written to disk.
+COMPRESSION_THRESHOLD = 1024
+COMPRESSED_SUFFIX = "+zlib"
+
+# Blob kinds stored in the `blobs` table.
+BLOB_FULL = "full"
+BLOB_DELTA = "delta"
+BLOB_EMPTY = "empty"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    base_version TEXT,
+    type TEXT NOT NULL,
+    blob BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver[str]):
+    """
+    Persistent LangGraph checkpointer backed by a local SQLite database in WAL mode.
+
+    Architecture Decision: Checkpoints are only useful once a superstep is complete,
+    so pending writes reported by `put_writes` are buffered in memory and flushed
+    together with the next `put` in a single transaction. A streaming node that
+    yields many chunk updates therefore costs one commit per superstep rather than
+    one per chunk.
+
+    Implementation Detail: List channels (such as `messages`) are stored as deltas:
+    when the new value extends the previously written one, only the appended items
+    are serialized, with a full snapshot every `snapshot_every` versions to bound
+    the reconstruction chain. Several processes may share the database file, so a
+    delta is only committed if its base blob still exists, otherwise it is written
+    as a full snapshot. Values are encoded with the serializer's msgpack
+    format and zlib-compressed above `COMPRESSION_THRESHOLD` bytes. Each thread keeps
+    at most `max_checkpoints` checkpoints once pruning kicks in.
+
+    Usage:
+        checkpointer = SQLiteCheckpointer("checkpoints.sqlite")
+        graph = workflow.compile(checkpointer=checkpointer)
+        config = {"configurable": {"thread_id": "my-thread"}}
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        max_checkpoints: int = 20,
+        snapshot_every: int = 32,
+        max_pending_writes: int = 1000,
+        delta_cache_size: int = 4096,
+    ):
+        super().__init__(serde=serde)
+        self.path = path
+        self.max_checkpoints = max_checkpoints
+        self.snapshot_every = snapshot_every
+        self.max_pending_writes = max_pending_writes
+        self.delta_cache_size = delta_cache_size
+
+        # `lock` guards the connection and the delta cache, `buffer_lock` only the
+        # in-memory write buffer, so buffering never waits on disk I/O.
+        self.lock = threading.RLock()
+        self.buffer_lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        # Buffered `writes` rows, keyed by primary key so repeated writes coalesce.
+        self._pending_writes: Dict[Tuple[str, str, str, str, int], tuple] = {}
+        # Last list written per (thread_id, checkpoint_ns, channel):
+        # (version, items, chain_length). Used to detect appends.
+        self._last_lists: "OrderedDict[Tuple[str, str, str], Tuple[str, list, int]]" = OrderedDict()
+
+    def __enter__(self) -> "SQLiteCheckpointer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "SQLiteCheckpointer":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        """Flush buffered writes and close the database connection."""
+        with self.lock:
+            self.flush()
+            self.conn.close()
+
+    # --- Serialization helpers ---
+
+    def _dumps(self, value: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= COMPRESSION_THRESHOLD:
+            return type_ + COMPRESSED_SUFFIX, zlib.compress(data, 1)
+        return type_, data
+
+    def _loads(self, type_: str, data: bytes) -> Any:
+        if type_.endswith(COMPRESSED_SUFFIX):
+            type_ = type_[: -len(COMPRESSED_SUFFIX)]
+            data = zlib.decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    def _encode_channel(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str, value: Any
+    ) -> Tuple[tuple, Optional[list]]:
+        """
+        Build the `blobs` row for a channel value, as a delta when possible.
+
+        Returns the row and, for deltas, the full list so the row can be rewritten
+        as a snapshot if its base is gone by commit time.
+
+        Implementation Detail: A delta is only written when the previously written
+        list for this channel is an unchanged prefix of the new one. Items are
+        compared by identity first, so the common `add_messages` case costs a
+        pointer comparison per message.
+        """
+        key = (thread_id, checkpoint_ns, channel)
+        if not isinstance(value, list):
+            self._last_lists.pop(key, None)
+            type_, data = self._dumps(value)
+            return (thread_id, checkpoint_ns, channel, version, BLOB_FULL, None, type_, data), None
+
+        previous = self._last_lists.get(key)
+        items = list(value)
+        if previous is not None:
+            base_version, base_items, chain = previous
+            n = len(base_items)
+            if (
+                chain < self.snapshot_every
+                and len(items) >= n
+                and all(a is b or a == b for a, b in zip(base_items, items))
+            ):
+                self._remember_list(key, (version, items, chain + 1))
+                type_, data = self._dumps(items[n:])
+                row = (
+                    thread_id, checkpoint_ns, channel, version,
+                    BLOB_DELTA, base_version, type_, data,
+                )
+                return row, items
+
+        self._remember_list(key, (version, items, 0))
+        type_, data = self._dumps(items)
+        return (thread_id, checkpoint_ns, channel, version, BLOB_FULL, None, type_, data), None
+
+    def _ensure_delta_base(self, row: tuple, items: Optional[list]) -> tuple:
+        """
+        Rewrite a delta row as a full snapshot if its base blob no longer exists.
+
+        Implementation Detail: The delta cache is per process, so another process
+        sharing the database may have pruned or deleted the base since it was
+        cached. `_prune` only ever deletes whole unreachable chains, so an existing
+        base always has its own chain intact. Called inside the write transaction,
+        which holds SQLite's write lock, so the base cannot disappear before the
+        row is committed.
+        """
+        thread_id, checkpoint_ns, channel, version, kind, base_version = row[:6]
+        if kind != BLOB_DELTA or self.conn.execute(
+            "SELECT 1 FROM blobs "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            (thread_id, checkpoint_ns, channel, base_version),
+        ).fetchone():
+            return row
+        self._remember_list((thread_id, checkpoint_ns, channel), (version, items, 0))
+        type_, data = self._dumps(items)
+        return (thread_id, checkpoint_ns, channel, version, BLOB_FULL, None, type_, data)
+
+    def _remember_list(self, key: Tuple[str, str, str], entry: Tuple[str, list, int]) -> None:
+        self._last_lists[key] = entry
+        self._last_lists.move_to_end(key)
+        while len(self._last_lists) > self.delta_cache_size:
+            self._last_lists.popitem(last=False)
+
+    def _load_channel(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> Any:
+        """Rebuild a channel value by following its delta chain back to a full snapshot."""
+        deltas: List[list] = []
+        while True:
+            row = self.conn.execute(
+                "SELECT kind, base_version, type, blob FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Missing blob for channel {channel!r} version {version!r}")
+            kind, base_version, type_, data = row
+            if kind != BLOB_DELTA:
+                break
+            deltas.append(self._loads(type_, data))
+            version = base_version
+
+        value = self._loads(type_, data)
+        for delta in reversed(deltas):
+            value = value + delta
+        return value
+
+    def _load_channel_values(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> Dict[str, Any]:
+        values = {}
+        for channel, version in versions.items():
+            row = self.conn.execute(
+                "SELECT kind FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            if row is None or row[0] == BLOB_EMPTY:
+                continue
+            values[channel] = self._load_channel(thread_id, checkpoint_ns, channel, version)
+        return values
+
+    # --- Write buffering ---
+
+    def flush(self) -> None:
+        """Write every buffered pending write in one transaction."""
+        self._commit([], None)
+
+    def _commit(self, blobs: List[Tuple[tuple, Optional[list]]], checkpoint: Optional[tuple]) -> None:
+        """
+        Write channel blobs, a checkpoint and every buffered pending write in one
+        transaction, then prune the checkpoint's thread if it grew past its
+        retention bound.
+
+        Implementation Detail: Regular writes are inserted with `INSERT OR IGNORE` so
+        the first value stored for a task and index wins, even across retries that
+        reach the database separately. Special channels (errors, interrupts) use
+        `INSERT OR REPLACE` and always overwrite.
+        """
+        with self.lock:
+            with self.buffer_lock:
+                writes, self._pending_writes = self._pending_writes, {}
+            if not (blobs or checkpoint or writes):
+                return
+            # IMMEDIATE takes the write lock up front, so other processes cannot
+            # prune between the delta base checks and the commit.
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._ensure_delta_base(row, items) for row, items in blobs],
+                )
+                if checkpoint:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        checkpoint,
+                    )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row for key, row in writes.items() if key[4] >= 0],
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row for key, row in writes.items() if key[4] < 0],
+                )
+                if checkpoint:
+                    self._prune(checkpoint[0], checkpoint[1])
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                # The delta cache may now point at versions that were never stored.
+                self._last_lists.clear()
+                raise
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        """
+        Drop the oldest checkpoints of a thread, with their writes and unreachable blobs.
+
+        Best Practice: Pruning only starts once a thread holds twice `max_checkpoints`
+        checkpoints, so its cost is amortized over many supersteps instead of being
+        paid on every commit.
+        """
+        (count,) = self.conn.execute(
+            "SELECT COUNT(*) FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+            (thread_id, checkpoint_ns),
+        ).fetchone()
+        if count <= 2 * self.max_checkpoints:
+            return
+
+        kept = self.conn.execute(
+            "SELECT checkpoint_id, type, checkpoint FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT ?",
+            (thread_id, checkpoint_ns, self.max_checkpoints),
+        ).fetchall()
+        oldest_kept = kept[-1][0]
+        self.conn.execute(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            (thread_id, checkpoint_ns, oldest_kept),
+        )
+        self.conn.execute(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            (thread_id, checkpoint_ns, oldest_kept),
+        )
+
+        # Keep exactly the blobs reachable from a kept checkpoint through delta bases.
+        # Anything else is deleted, so every blob left in the table has a complete
+        # chain and a surviving delta base is always safe to build on.
+        bases = {
+            (channel, version): base_version
+            for channel, version, base_version in self.conn.execute(
+                "SELECT channel, version, base_version FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            )
+        }
+        reachable = set()
+        for _, type_, data in kept:
+            for channel, version in self._loads(type_, data)["channel_versions"].items():
+                key: Optional[Tuple[str, str]] = (channel, str(version))
+                while key is not None and key in bases and key not in reachable:
+                    reachable.add(key)
+                    key = (channel, bases[key]) if bases[key] is not None else None
+
+        unreachable = [key for key in bases if key not in reachable]
+        self.conn.executemany(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            [(thread_id, checkpoint_ns, channel, version) for channel, version in unreachable],
+        )
+        for channel, version in unreachable:
+            cached = self._last_lists.get((thread_id, checkpoint_ns, channel))
+            if cached is not None and cached[0] == version:
+                del self._last_lists[(thread_id, checkpoint_ns, channel)]
+
+    # --- BaseCheckpointSaver interface ---
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Get the checkpoint matching `checkpoint_id` in the config, or the latest
+        checkpoint of the thread when no ID is given.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self.lock:
+            self.flush()
+            if checkpoint_id:
+                row = self.conn.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                    "metadata_type, metadata FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                    "metadata_type, metadata FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._build_tuple(thread_id, checkpoint_ns, row)
+
+    def _build_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, data, metadata_type, metadata = row
+        checkpoint = self._loads(type_, data)
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(
+                    thread_id, checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=self._loads(metadata_type, metadata),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self._loads(w_type, value))
+                for task_id, channel, w_type, value in writes
+            ],
+        )
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints newest first, filtered by config, metadata and `before`."""
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, "
+            "checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        clauses: List[str] = []
+        params: List[Any] = []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self.lock:
+            self.flush()
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    metadata = self._loads(row[4], row[5])
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                results.append(self._build_tuple(thread_id, checkpoint_ns, tuple(row)))
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Save a checkpoint and flush everything buffered since the previous one.
+
+        Only channels listed in `new_versions` are serialized; unchanged channels
+        keep pointing at the blob written for their current version.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        c = checkpoint.copy()
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+        type_, data = self._dumps(c)
+        metadata_type, metadata_data = self._dumps(get_checkpoint_metadata(config, metadata))
+        row = (
+            thread_id,
+            checkpoint_ns,
+            checkpoint["id"],
+            config["configurable"].get("checkpoint_id"),
+            type_,
+            data,
+            metadata_type,
+            metadata_data,
+        )
+        with self.lock:
+            blobs = []
+            for channel, version in new_versions.items():
+                version = str(version)
+                if channel in values:
+                    blobs.append(
+                        self._encode_channel(thread_id, checkpoint_ns, channel, version, values[channel])
+                    )
+                else:
+                    blobs.append(
+                        ((thread_id, checkpoint_ns, channel, version, BLOB_EMPTY, None, "empty", b""), None)
+                    )
+            self._commit(blobs, row)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Buffer intermediate writes until the superstep's checkpoint is saved.
+
+        Implementation Detail: Regular writes keep the first value stored for a
+        given task and index, while special channels (errors, interrupts) always
+        overwrite, matching the semantics of the reference savers.
+        """
+        if self._buffer_writes(config, writes, task_id, task_path):
+            self.flush()
+
+    def _buffer_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str,
+    ) -> bool:
+        """Add writes to the buffer and return True once it should be flushed."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = {}
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            type_, data = self._dumps(value)
+            rows[(thread_id, checkpoint_ns, checkpoint_id, task_id, idx)] = (
+                thread_id, checkpoint_ns, checkpoint_id, task_id, idx,
+                channel, type_, data, task_path,
+            )
+        with self.buffer_lock:
+            for key, row in rows.items():
+                if key[4] >= 0 and key in self._pending_writes:
+                    continue
+                self._pending_writes[key] = row
+            return len(self._pending_writes) >= self.max_pending_writes
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint, blob and write stored for a thread."""
+        with self.lock:
+            self.flush()
+            for table in ("checkpoints", "blobs", "writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            for key in [k for k in self._last_lists if k[0] == thread_id]:
+                del self._last_lists[key]
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for result in results:
+            yield result
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        # Buffering only takes the in-memory buffer lock, so it stays on the event
+        # loop; the occasional flush of a full buffer runs in a worker thread.
+        if self._buffer_writes(config, writes, task_id, task_path):
+            await asyncio.to_thread(self.flush)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+def create_checkpointer() -> SQLiteCheckpointer:
+    """Create the checkpointer used by the main graph, stored at `CHECKPOINT_DB_PATH`."""
+    return SQLiteCheckpointer(os.getenv("CHECKPOINT_DB_PATH", "checkpoints.sqlite"))
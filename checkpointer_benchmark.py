@@ -0,0 +1,93 @@
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
+from langgraph.graph import END, StateGraph
+from types_test import GraphWithMessagesState
+from checkpointer import SQLiteCheckpointer
+
+CONCURRENCY = 200
+TURNS = 10
+CHUNKS_PER_ANSWER = 50
+
+
+async def fake_stream_node(state: GraphWithMessagesState):
+    """
+    Same shape as stream_from_agent_node, without calling an LLM.
+    """
+    answer_id = f"answer-{len(state.messages)}"
+    full = None
+    for i in range(CHUNKS_PER_ANSWER):
+        chunk = AIMessageChunk(content=f"token {i} ", id=answer_id)
+        full = chunk if full is None else full + chunk
+        await asyncio.sleep(0)
+    return {"messages": [full]}
+
+
+def build_graph(checkpointer=None):
+    workflow = StateGraph(GraphWithMessagesState)
+    workflow.add_node("agent_node", fake_stream_node)
+    workflow.set_entry_point("agent_node")
+    workflow.add_edge("agent_node", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+async def run_conversation(graph, thread_id: str) -> list[float]:
+    """Run TURNS turns on one thread and return the duration of each turn in ms."""
+    config = {"configurable": {"thread_id": thread_id}}
+    durations = []
+    for turn in range(TURNS):
+        inputs = {
+            "messages": [
+                SystemMessage(content="You are a helpful assistant.", id="system_prompt"),
+                HumanMessage(content=f"Question {turn} " * 20),
+            ]
+        }
+        start = time.perf_counter()
+        async for _ in graph.astream_events(inputs, config):
+            pass
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+async def measure(graph) -> tuple[float, list[float]]:
+    """Return the wall-clock time of the whole run in ms and every turn duration."""
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_conversation(graph, f"thread-{i}") for i in range(CONCURRENCY))
+    )
+    wall = (time.perf_counter() - start) * 1000
+    return wall, [duration for durations in results for duration in durations]
+
+
+async def main():
+    print(f"=== {CONCURRENCY} concurrent threads, {TURNS} turns, {CHUNKS_PER_ANSWER} chunks per answer ===")
+
+    baseline_wall, baseline = await measure(build_graph())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with SQLiteCheckpointer(os.path.join(tmp, "checkpoints.sqlite")) as checkpointer:
+            checkpointed_wall, checkpointed = await measure(build_graph(checkpointer))
+
+    for name, durations in (("no checkpointer", baseline), ("sqlite checkpointer", checkpointed)):
+        print(
+            f"{name:>20}: mean {statistics.mean(durations):.2f} ms/turn, "
+            f"p50 {statistics.median(durations):.2f} ms, "
+            f"p95 {statistics.quantiles(durations, n=20)[-1]:.2f} ms"
+        )
+
+    # Latency seen by each client, including time spent waiting on other threads
+    latency = statistics.mean(checkpointed) - statistics.mean(baseline)
+    p50_latency = statistics.median(checkpointed) - statistics.median(baseline)
+    print(f"per-turn latency change: mean {latency:+.2f} ms, p50 {p50_latency:+.2f} ms")
+
+    # Turns share one event loop, so the extra wall-clock time divided by the number
+    # of turns is the throughput cost of a turn, amortized over all threads
+    amortized = (checkpointed_wall - baseline_wall) / (CONCURRENCY * TURNS)
+    print(f"amortized cost: {amortized:.3f} ms/turn of process time")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,23 @@
 import json
 import os
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+import uuid
+from typing import Any, AsyncIterator
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.runnables import RunnableConfig
 from langgraph.pregel import Pregel
 from types_test import LLMParams, InputMessage
 from loading_graph import loading_graph
+from artifacts import PROGRESS_POLL_INTERVAL, ArtifactTracker, create_run_output_location
 
 import asyncio
 
-async def get_agent_http_streamed_result(graph: Pregel, message: InputMessage):
+async def get_agent_http_streamed_result(
+    graph: Pregel,
+    message: InputMessage,
+    output_generation_path: str | None = None,
+    generation_output_url: str | None = None,
+):
     files_prompt_part = ""
     if message.input_urls:
         input_urls_str = "\n".join([f"- {url}" for url in message.input_urls])
@@ -44,22 +53,99 @@ You ALWAYS respond in valid Markdown syntax."""
 
     messages_with_sys_prompt = {
         "messages": [
-            SystemMessage(content=sys_prompt),
+            # Fixed id so a checkpointed thread replaces the prompt instead of appending it every turn
+            SystemMessage(content=sys_prompt, id="system_prompt"),
             *inputs["messages"],
         ]
     }
+    # The output directory is server configuration, never taken from the request.
+    # Each run gets its own subdirectory so concurrent users never see each other's files.
+    output_generation_path = output_generation_path or os.getenv("OUTPUT_GENERATION_PATH")
+    if output_generation_path:
+        run_output_path, run_output_url = create_run_output_location(
+            output_generation_path,
+            generation_output_url or os.getenv("GENERATION_OUTPUT_URL"),
+            str(uuid.uuid4()),
+        )
+        messages_with_sys_prompt["output_generation_path"] = run_output_path
+        messages_with_sys_prompt["generation_output_url"] = run_output_url
 
-    async for result in get_agent_streamed_result(graph, messages_with_sys_prompt):
+    config = {"configurable": {"thread_id": message.thread_id}} if message.thread_id else None
+
+    async for result in get_agent_streamed_result(graph, messages_with_sys_prompt, config):
         if result["type"] == "chunk" and result["content"].strip() != "":
             yield f"data: {json.dumps({'type': 'chunk', 'content': result['content']})}\n\n"
         elif result["type"] == "end" and result["content"].strip() != "":
             yield f"data: {json.dumps({'type': 'end', 'content': result['content']})}\n\n"
         elif result["type"] == "loading":
             yield f"data: {json.dumps({'type': 'loading', 'content': result['content']})}\n\n"
+        elif result["type"] in ("artifact", "artifact_progress"):
+            yield f"data: {json.dumps({'type': result['type'], 'content': result['content']})}\n\n"
     yield "data: [DONE]\n\n"
 
-async def get_agent_streamed_result(graph: Pregel, inputs: dict[str, list[BaseMessage]]):
+async def get_agent_streamed_result(
+    graph: Pregel,
+    inputs: dict[str, Any],
+    config: RunnableConfig | None = None,
+):
+    # Without a thread_id there is no conversation to resume, so the run skips the
+    # checkpointer entirely and stateless traffic never writes to the database
+    config = config or {}
+    if graph.checkpointer and not config.get("configurable", {}).get("thread_id"):
+        graph = graph.copy(update={"checkpointer": None})
+
+    async for result in stream_agent_events(graph, inputs, config):
+        yield result
+
+async def with_idle_ticks(events: AsyncIterator, interval: float):
+    """
+    Yield the items of `events`, and None whenever `interval` seconds pass without one.
+
+    Implementation Detail: A single task consumes `events` into a queue, so the
+    source always runs in the same task while the caller still wakes up
+    periodically to do work of its own.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    end = object()
+
+    async def consume():
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        finally:
+            queue.put_nowait(end)
+
+    consumer = asyncio.create_task(consume())
+    next_item = asyncio.ensure_future(queue.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_item}, timeout=interval)
+            if not done:
+                yield None
+                continue
+            item = next_item.result()
+            if item is end:
+                break
+            next_item = asyncio.ensure_future(queue.get())
+            yield item
+        # Re-raise any error from the source
+        await consumer
+    finally:
+        next_item.cancel()
+        consumer.cancel()
+        # Let the source finish its own cleanup before the caller moves on
+        await asyncio.wait({consumer})
+
+async def stream_agent_events(graph: Pregel, inputs: dict[str, Any], config: RunnableConfig):
     first_loading_message_sent = False
+    # Built in a thread since the constructor scans the output directory
+    artifact_tracker = (
+        await asyncio.to_thread(
+            ArtifactTracker, inputs["output_generation_path"], inputs.get("generation_output_url")
+        )
+        if inputs.get("output_generation_path")
+        else None
+    )
     tool_executing = False
     current_tool_name = None
 
@@ -98,7 +184,17 @@ async def get_agent_streamed_result(graph: Pregel, inputs: dict[str, list[BaseMe
             # print("--- Loading messages task cancelled ---", flush=True)
             raise
 
-    async for event in graph.astream_events(inputs):
+    async for event in with_idle_ticks(graph.astream_events(inputs, config), PROGRESS_POLL_INTERVAL):
+        # No event for a while: announce what the running tool has written so far
+        if event is None:
+            if tool_executing and artifact_tracker:
+                for progress in await artifact_tracker.progress():
+                    yield {
+                        "content": progress.model_dump(),
+                        "type": "artifact_progress",
+                    }
+            continue
+
         event_kind = event["event"]
         
         # Initial loading message
@@ -141,6 +237,14 @@ async def get_agent_streamed_result(graph: Pregel, inputs: dict[str, list[BaseMe
                             "type": "loading",
                         }
                         message_count += 1
+
+                        # Announce bytes the tool has already written so clients can start fetching them
+                        if artifact_tracker:
+                            for progress in await artifact_tracker.progress():
+                                yield {
+                                    "content": progress.model_dump(),
+                                    "type": "artifact_progress",
+                                }
                         
                         # Attendre entre les messages
                         await asyncio.sleep(2)
@@ -154,6 +258,14 @@ async def get_agent_streamed_result(graph: Pregel, inputs: dict[str, list[BaseMe
             # print("--- Tool execution ended ---", flush=True)
             tool_executing = False
             current_tool_name = None
+
+            # Announce the files generated by the tool with their size and hash
+            if artifact_tracker:
+                for artifact in await artifact_tracker.finalize():
+                    yield {
+                        "content": artifact.model_dump(),
+                        "type": "artifact",
+                    }
         
         # Chat model streaming (normal response)
         elif event_kind == "on_chat_model_stream":
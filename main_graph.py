@@ -11,6 +11,7 @@ load_dotenv()
 # Imports après le chargement du .env
 from types_test import LLMParams, GraphWithMessagesState, LLMSingleton
 from engine_test import get_llm_with_params
+from checkpointer import create_checkpointer
 
 from slow_tool import slow_tool
 
@@ -53,12 +54,18 @@ def should_continue_node(state: GraphWithMessagesState) -> Literal["tools", "__e
 async def stream_from_agent_node(state: GraphWithMessagesState):
     """
     Stream the answer to the given prompt.
+
+    Chunks reach the client through `on_chat_model_stream` events, so the node
+    merges them and writes the full answer to the state once. Every chunk shares
+    the same id, so writing them one by one would only keep the last chunk.
     """
     agent = MainAgent()
     stream = agent.llm.astream(state.messages)
+    full = None
     async for chunk in stream:
         print("stream_from_agent_node", chunk.content, flush=True)
-        yield {"messages": [chunk]}
+        full = chunk if full is None else full + chunk
+    return {"messages": [full] if full is not None else []}
 
 
 # node that will automatically execute the tools for us
@@ -83,4 +90,5 @@ workflow.add_conditional_edges(
 # after the tools are executed, route back to the agent node to respond to the user
 workflow.add_edge("tools", "agent_node")
 
-main_agent = workflow.compile()
+# persist conversation state per thread_id so it survives worker restarts
+main_agent = workflow.compile(checkpointer=create_checkpointer())
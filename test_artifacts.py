@@ -0,0 +1,190 @@
+import asyncio
+import errno
+import hashlib
+import os
+import socket
+import threading
+import pytest
+from artifacts import (
+    ArtifactTracker,
+    create_run_output_location,
+    open_artifact_range,
+    parse_range_header,
+    resolve_artifact_path,
+    send_artifact,
+)
+from engine_test import with_idle_ticks
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, (0, 99)),
+        ("bytes=10-19", (10, 19)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=-5", (95, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=50-500", (50, 99)),
+    ],
+)
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=20-10", "bytes=100-", "items=0-1", "bytes=0-1,5-6", "bytes=a-b"])
+def test_parse_range_header_rejects_invalid_ranges(header):
+    with pytest.raises(ValueError):
+        parse_range_header(header, 100)
+
+
+def test_resolve_artifact_path_rejects_escapes(tmp_path):
+    assert resolve_artifact_path(str(tmp_path), "a.png") == str(tmp_path / "a.png")
+    for name in ("../a.png", "/etc/passwd", "."):
+        with pytest.raises(ValueError):
+            resolve_artifact_path(str(tmp_path), name)
+
+
+def read_all(sock: socket.socket, received: bytearray):
+    while chunk := sock.recv(1 << 16):
+        received.extend(chunk)
+
+
+def test_send_artifact_over_socket(tmp_path):
+    data = os.urandom(3 * 1024 * 1024)
+    path = tmp_path / "video.mp4"
+    path.write_bytes(data)
+
+    sender, receiver = socket.socketpair()
+    received = bytearray()
+    reader = threading.Thread(target=read_all, args=(receiver, received))
+    reader.start()
+    with sender:
+        assert send_artifact(sender.fileno(), str(path), 100, 2_500_000) == 2_500_000 - 100 + 1
+    reader.join()
+    receiver.close()
+    assert bytes(received) == data[100:2_500_001]
+
+
+def test_send_artifact_falls_back_to_pread(tmp_path, monkeypatch):
+    data = os.urandom(3 * 1024 * 1024)
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(data)
+
+    def unsupported(*args):
+        raise OSError(errno.EINVAL, "sendfile not supported")
+
+    monkeypatch.setattr(os, "sendfile", unsupported)
+    sender, receiver = socket.socketpair()
+    received = bytearray()
+    reader = threading.Thread(target=read_all, args=(receiver, received))
+    reader.start()
+    with sender:
+        # Spans several CHUNK_SIZE reads
+        assert send_artifact(sender.fileno(), str(path), 10, 2_500_000) == 2_500_000 - 10 + 1
+    reader.join()
+    receiver.close()
+    assert bytes(received) == data[10:2_500_001]
+
+
+def test_open_artifact_range(tmp_path):
+    (tmp_path / "empty").write_bytes(b"")
+    (tmp_path / "data").write_bytes(b"0123456789")
+    with open_artifact_range(str(tmp_path / "empty")) as view:
+        assert len(view) == 0
+    with open_artifact_range(str(tmp_path / "data"), 2, 4) as view:
+        assert bytes(view) == b"234"
+
+
+def test_tracker_reports_progress_and_artifacts(tmp_path):
+    (tmp_path / "old.png").write_bytes(b"old")
+    tracker = ArtifactTracker(str(tmp_path), "https://cdn.example.com/out/")
+
+    with open(tmp_path / "my song #1.mp3", "wb") as f:
+        f.write(b"a" * 10)
+        f.flush()
+        [progress] = asyncio.run(tracker.progress())
+        assert (progress.offset, progress.length) == (0, 10)
+        assert progress.url == "https://cdn.example.com/out/my%20song%20%231.mp3"
+        f.write(b"b" * 5)
+    [progress] = asyncio.run(tracker.progress())
+    assert (progress.offset, progress.length) == (10, 5)
+    assert asyncio.run(tracker.progress()) == []
+
+    [artifact] = asyncio.run(tracker.finalize())
+    assert artifact.name == "my song #1.mp3"
+    assert artifact.size == 15
+    assert artifact.sha256 == hashlib.sha256(b"a" * 10 + b"b" * 5).hexdigest()
+    assert artifact.content_type == "audio/mpeg"
+    assert asyncio.run(tracker.finalize()) == []
+
+
+def test_tracker_skips_symlinks_outside_directory(tmp_path):
+    outside = tmp_path / "secret.txt"
+    outside.write_bytes(b"secret")
+    output = tmp_path / "out"
+    output.mkdir()
+    tracker = ArtifactTracker(str(output))
+
+    os.symlink(outside, output / "link.txt")
+    (output / "image.png").write_bytes(b"png")
+    assert [p.name for p in asyncio.run(tracker.progress())] == ["image.png"]
+    assert [a.name for a in asyncio.run(tracker.finalize())] == ["image.png"]
+
+
+def test_tracker_restarts_progress_of_rewritten_files(tmp_path):
+    tracker = ArtifactTracker(str(tmp_path))
+    path = tmp_path / "clip.wav"
+    path.write_bytes(b"a" * 100)
+    [progress] = asyncio.run(tracker.progress())
+    assert (progress.offset, progress.length) == (0, 100)
+
+    # Truncated and written again, shorter than before
+    path.write_bytes(b"b" * 40)
+    [progress] = asyncio.run(tracker.progress())
+    assert (progress.offset, progress.length) == (0, 40)
+
+    # Replaced by a new file of the same size or larger
+    (tmp_path / "clip.tmp").write_bytes(b"c" * 60)
+    os.replace(tmp_path / "clip.tmp", path)
+    [progress] = asyncio.run(tracker.progress())
+    assert (progress.offset, progress.length) == (0, 60)
+
+
+def test_concurrent_runs_only_see_their_own_files(tmp_path):
+    async def run(run_id: str, names: list[str]):
+        path, url = create_run_output_location(str(tmp_path), "https://cdn.example.com/out", run_id)
+        tracker = ArtifactTracker(path, url)
+        for name in names:
+            with open(os.path.join(path, name), "wb") as f:
+                f.write(run_id.encode())
+            await asyncio.sleep(0.01)
+        progress = await tracker.progress()
+        return progress, await tracker.finalize()
+
+    async def main():
+        return await asyncio.gather(run("run-a", ["a.png", "shared.mp3"]), run("run-b", ["b.png", "shared.mp3"]))
+
+    (progress_a, artifacts_a), (progress_b, artifacts_b) = asyncio.run(main())
+    assert [p.name for p in progress_a] == [a.name for a in artifacts_a] == ["a.png", "shared.mp3"]
+    assert [p.name for p in progress_b] == [a.name for a in artifacts_b] == ["b.png", "shared.mp3"]
+    assert artifacts_a[1].url == "https://cdn.example.com/out/run-a/shared.mp3"
+    assert artifacts_b[1].sha256 == hashlib.sha256(b"run-b").hexdigest()
+
+
+def test_with_idle_ticks():
+    async def events():
+        yield 1
+        await asyncio.sleep(0.25)
+        yield 2
+        raise RuntimeError("source failed")
+
+    async def main():
+        items = []
+        with pytest.raises(RuntimeError):
+            async for item in with_idle_ticks(events(), 0.1):
+                items.append(item)
+        return items
+
+    items = asyncio.run(main())
+    assert items[0] == 1 and items[-1] == 2
+    assert None in items
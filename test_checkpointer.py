@@ -0,0 +1,185 @@
+import asyncio
+import time
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.checkpoint.base import ERROR
+from langgraph.checkpoint.memory import InMemorySaver
+from checkpointer import BLOB_DELTA, BLOB_FULL, SQLiteCheckpointer
+from checkpointer_benchmark import build_graph
+from engine_test import get_agent_streamed_result
+
+
+def summarize(messages):
+    """Message types and contents, ignoring the random ids of human messages."""
+    return [(type(m).__name__, m.content) for m in messages]
+
+
+async def run_turns(graph, thread_id: str, turns: range):
+    config = {"configurable": {"thread_id": thread_id}}
+    for turn in turns:
+        await graph.ainvoke(
+            {
+                "messages": [
+                    SystemMessage(content="You are a helpful assistant.", id="system_prompt"),
+                    HumanMessage(content=f"Question {turn}"),
+                ]
+            },
+            config,
+        )
+
+
+async def get_messages(graph, config):
+    return summarize((await graph.aget_state(config)).values["messages"])
+
+
+def test_matches_in_memory_saver(tmp_path):
+    async def main():
+        config = {"configurable": {"thread_id": "t"}}
+        reference = build_graph(InMemorySaver())
+        await run_turns(reference, "t", range(10))
+
+        with SQLiteCheckpointer(str(tmp_path / "db.sqlite"), snapshot_every=3) as checkpointer:
+            graph = build_graph(checkpointer)
+            await run_turns(graph, "t", range(10))
+            assert await get_messages(graph, config) == await get_messages(reference, config)
+            kinds = {row[0] for row in checkpointer.conn.execute("SELECT kind FROM blobs")}
+            assert {BLOB_FULL, BLOB_DELTA} <= kinds
+
+        # A new instance rebuilds the same state from disk
+        with SQLiteCheckpointer(str(tmp_path / "db.sqlite")) as checkpointer:
+            graph = build_graph(checkpointer)
+            assert await get_messages(graph, config) == await get_messages(reference, config)
+            # The full answer is stored, not only its last chunk
+            assert (await graph.aget_state(config)).values["messages"][-1].content.count("token") == 50
+
+    asyncio.run(main())
+
+
+def test_prune_keeps_retained_checkpoints_loadable(tmp_path):
+    async def main():
+        config = {"configurable": {"thread_id": "t"}}
+        reference = build_graph(InMemorySaver())
+        await run_turns(reference, "t", range(30))
+
+        with SQLiteCheckpointer(str(tmp_path / "db.sqlite"), max_checkpoints=4, snapshot_every=5) as checkpointer:
+            graph = build_graph(checkpointer)
+            await run_turns(graph, "t", range(30))
+            assert await get_messages(graph, config) == await get_messages(reference, config)
+
+            history = list(checkpointer.list(config))
+            assert 4 <= len(history) <= 8
+            # Every retained checkpoint still resolves its whole delta chain
+            for checkpoint_tuple in history:
+                assert checkpoint_tuple.checkpoint["channel_values"] is not None
+
+            blob_count = checkpointer.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+            assert blob_count < 30 * 3
+
+    asyncio.run(main())
+
+
+def test_fork_from_older_checkpoint(tmp_path):
+    async def main():
+        results = []
+        for saver in (InMemorySaver(), SQLiteCheckpointer(str(tmp_path / "db.sqlite"))):
+            graph = build_graph(saver)
+            config = {"configurable": {"thread_id": "t"}}
+            await run_turns(graph, "t", range(4))
+            # Fork from the state after the second turn
+            history = [state async for state in graph.aget_state_history(config)]
+            fork_config = next(
+                state.config for state in history if len(state.values.get("messages", [])) == 5
+            )
+            await graph.ainvoke({"messages": [HumanMessage(content="Forked")]}, fork_config)
+            results.append(await get_messages(graph, config))
+        assert results[0] == results[1]
+        assert results[1][-2] == ("HumanMessage", "Forked")
+
+    asyncio.run(main())
+
+
+def test_instances_sharing_database(tmp_path):
+    """Workers taking turns on one thread must not write deltas on pruned blobs."""
+    async def main():
+        config = {"configurable": {"thread_id": "t"}}
+        reference = build_graph(InMemorySaver())
+        await run_turns(reference, "t", range(60))
+
+        path = str(tmp_path / "db.sqlite")
+        with SQLiteCheckpointer(path) as worker_a, SQLiteCheckpointer(path) as worker_b:
+            graphs = [build_graph(worker_a), build_graph(worker_b)]
+            for start in range(0, 60, 20):
+                await run_turns(graphs[(start // 20) % 2], "t", range(start, start + 20))
+            for graph in graphs:
+                assert await get_messages(graph, config) == await get_messages(reference, config)
+
+    asyncio.run(main())
+
+
+def test_put_writes_first_value_wins_across_flushes():
+    checkpointer = SQLiteCheckpointer()
+    config = {"configurable": {"thread_id": "t", "checkpoint_ns": "", "checkpoint_id": "1"}}
+    checkpointer.put_writes(config, [("messages", "first"), (ERROR, "first error")], "task")
+    checkpointer.flush()
+    checkpointer.put_writes(config, [("messages", "retry"), (ERROR, "retry error")], "task")
+    checkpointer.flush()
+
+    rows = checkpointer.conn.execute("SELECT channel, type, value FROM writes ORDER BY idx").fetchall()
+    values = {channel: checkpointer._loads(type_, value) for channel, type_, value in rows}
+    assert values == {"messages": "first", ERROR: "retry error"}
+
+
+def test_delete_thread():
+    async def main():
+        checkpointer = SQLiteCheckpointer()
+        graph = build_graph(checkpointer)
+        await run_turns(graph, "t", range(2))
+        await checkpointer.adelete_thread("t")
+        for table in ("checkpoints", "blobs", "writes"):
+            assert checkpointer.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+        assert await checkpointer.aget_tuple({"configurable": {"thread_id": "t"}}) is None
+
+    asyncio.run(main())
+
+
+def test_instances_interleaving_with_pruning(tmp_path):
+    """A worker's cached delta base must not survive with a broken chain after another worker prunes."""
+    async def main():
+        config = {"configurable": {"thread_id": "t"}}
+        reference = build_graph(InMemorySaver())
+        order = "abaabba"
+        await run_turns(reference, "t", range(len(order)))
+
+        path = str(tmp_path / "db.sqlite")
+        with SQLiteCheckpointer(path, max_checkpoints=2) as worker_a, SQLiteCheckpointer(path, max_checkpoints=2) as worker_b:
+            graphs = {"a": build_graph(worker_a), "b": build_graph(worker_b)}
+            for turn, worker in enumerate(order):
+                await run_turns(graphs[worker], "t", range(turn, turn + 1))
+            for graph in graphs.values():
+                assert await get_messages(graph, config) == await get_messages(reference, config)
+
+    asyncio.run(main())
+
+
+def test_stream_without_thread_id_writes_nothing():
+    """Requests without a thread_id, finished or cancelled mid-stream, leave no rows behind."""
+    class SlowCheckpointer(SQLiteCheckpointer):
+        def put(self, *args, **kwargs):
+            time.sleep(0.1)
+            return super().put(*args, **kwargs)
+
+    async def consume(graph):
+        async for _ in get_agent_streamed_result(graph, {"messages": [HumanMessage(content="Hi")]}):
+            pass
+
+    async def main():
+        checkpointer = SlowCheckpointer()
+        graph = build_graph(checkpointer)
+        await consume(graph)
+        run = asyncio.create_task(consume(graph))
+        await asyncio.sleep(0.05)
+        run.cancel()
+        await asyncio.gather(run, return_exceptions=True)
+        await asyncio.sleep(0.3)
+        assert checkpointer.conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] == 0
+
+    asyncio.run(main())
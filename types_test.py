@@ -19,6 +19,7 @@ class InputMessage(BaseModel):
     agent_params: LLMParams | None = None
     input_urls: Optional[List[str]] = Field(default=[])
     message: str
+    thread_id: str | None = None
 
 class UrlsPayload(BaseModel):
     input_urls: Optional[List[str]] = Field(